@@ -1,113 +1,533 @@
+import argparse
+import bisect
+import errno
 import os
 import subprocess
+import sys
+import tempfile
+import time
+import zipfile
 from nptdms import TdmsFile
+import h5py
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
 import json
+import multiprocessing
 import shutil
-from scipy.io import savemat
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
 
-def decompress_zip_files(input_folder, output_folder, selected_files):
+# Métodos de compresión que el módulo zipfile puede descomprimir en el propio proceso
+METODOS_ZIP_SOPORTADOS = {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA}
+
+# Tamaño del bloque de copia al extraer (1 MiB)
+TAMANO_BLOQUE_COPIA = 1 << 20
+
+# Número máximo de ZIP que se extraen en una misma ejecución de 7-Zip
+LOTE_7Z = 16
+
+# Subcarpeta donde se escribe el dataset Parquet particionado por día
+CARPETA_PARQUET = 'parquet'
+
+# Caché por proceso de los esquemas de canales TDMS ya vistos (ver _esquema_tdms)
+_ESQUEMAS_TDMS = {}
+
+# Tamaño del buffer de escritura de los archivos Feather y CSV (4 MiB), para reducir las llamadas a write()
+TAMANO_BUFFER_ESCRITURA = 4 * 1024 * 1024
+
+# Tamaño de los bloques que el lector de CSV de Arrow parsea en paralelo (16 MiB; por defecto es 1 MiB)
+TAMANO_BLOQUE_LECTURA_CSV = 16 * 1024 * 1024
+
+# Muestras por bloque (chunk) en los datasets HDF5 de los .mat v7.3
+FILAS_POR_BLOQUE = 65536
+
+# Filas que se leen de cada canal del TDMS por bloque al convertir a Feather (acota la memoria por archivo)
+FILAS_POR_LECTURA = 1 << 20
+
+# Código int16 reservado para los NaN al cuantizar (los valores válidos usan -32767..32767)
+CODIGO_NAN_INT16 = -32768
+
+# Clase de MATLAB correspondiente a cada tipo de NumPy guardado en los .mat
+# (los booleanos se guardan como uint8 con la clase 'logical')
+CLASES_MATLAB = {
+    'float64': 'double',
+    'float32': 'single',
+    'int64': 'int64',
+    'int32': 'int32',
+    'int16': 'int16',
+    'int8': 'int8',
+    'uint64': 'uint64',
+    'uint32': 'uint32',
+    'uint16': 'uint16',
+    'uint8': 'uint8',
+    'bool': 'logical',
+}
+
+def _crear_executor(num_workers):
+    """
+    Crea un pool de procesos (contexto 'spawn') para el trabajo intensivo en CPU.
+    Si la plataforma no permite crear procesos, recurre a un pool de hilos.
+    """
+    try:
+        return ProcessPoolExecutor(max_workers=num_workers, mp_context=multiprocessing.get_context('spawn'))
+    except (ImportError, NotImplementedError, OSError) as e:
+        print(f"No se pudo crear un pool de procesos ({e}). Se usarán hilos.")
+        return ThreadPoolExecutor(max_workers=num_workers)
+
+def _tamano_lote(num_tareas, num_workers):
+    """
+    Número de tareas que el pool entrega a cada proceso por envío (unos 4 lotes por proceso).
+    """
+    return max(1, num_tareas // ((num_workers or os.cpu_count() or 1) * 4))
+
+def _mapear_en_orden(executor, funcion, tareas, ventana):
+    """
+    Como executor.map, entrega (tarea, resultado) en el orden de las tareas, pero con a lo sumo
+    'ventana' tareas enviadas y no consumidas: cada resultado consumido libera el lugar para
+    enviar la siguiente, así los resultados ya leídos no se acumulan en memoria cuando el
+    consumidor es más lento que los procesos.
+    """
+    pendientes = deque()
+    tareas = iter(tareas)
+    for tarea in tareas:
+        pendientes.append((tarea, executor.submit(funcion, tarea)))
+        if len(pendientes) >= ventana:
+            break
+    while pendientes:
+        tarea, futuro = pendientes.popleft()
+        resultado = futuro.result()
+        siguiente = next(tareas, None)
+        if siguiente is not None:
+            pendientes.append((siguiente, executor.submit(funcion, siguiente)))
+        yield tarea, resultado
+
+def _nombre_libre(nombre, usados):
+    """
+    Devuelve un nombre libre y lo reserva en el diccionario de nombres usados.
+    El diccionario guarda, para cada nombre, el último sufijo asignado, de modo que
+    el siguiente sufijo se calcula directamente sin sondear el disco.
+    """
+    if nombre not in usados:
+        usados[nombre] = 0
+        return nombre
+
+    base, ext = os.path.splitext(nombre)
+    while True:
+        usados[nombre] += 1
+        candidato = f"{base}_{usados[nombre]}{ext}"
+        if candidato not in usados:
+            usados[candidato] = 0
+            return candidato
+
+def _extraer_miembros(zip_path, tareas):
+    """
+    Extrae un tramo de entradas del ZIP, cada una en su ruta de destino (tareas: lista de
+    (ZipInfo, ruta)). El proceso abre el ZipFile una sola vez para todo el tramo (lectura
+    concurrente segura, sin volver a leer el directorio central por entrada); cada entrada se
+    escribe en un archivo parcial y se renombra al terminar para no dejar archivos truncados.
+    Un error en una entrada se informa y no impide extraer las demás.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        for info, dest_path in tareas:
+            parcial = dest_path + '.part'
+            try:
+                with zf.open(info) as origen, open(parcial, 'wb') as destino:
+                    shutil.copyfileobj(origen, destino, length=TAMANO_BLOQUE_COPIA)
+                os.replace(parcial, dest_path)
+            except Exception as e:
+                print(f"Error al descomprimir {info.filename} de {os.path.basename(zip_path)}: {e}")
+                if os.path.exists(parcial):
+                    os.remove(parcial)
+
+def _aplanar_carpeta(carpeta, output_folder, usados):
+    """
+    Mueve todos los archivos de carpeta (recursivamente) a output_folder y elimina la carpeta,
+    en una sola pasada con os.scandir (recorrido con pila, sin recursión). Los archivos se
+    renombran con os.rename, una sola llamada al sistema; solo si la subcarpeta está en otro
+    sistema de archivos (EXDEV) se recurre a shutil.move.
+    """
+    pendientes = [carpeta]
+    visitadas = []
+    while pendientes:
+        actual = pendientes.pop()
+        visitadas.append(actual)
+        with os.scandir(actual) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    pendientes.append(entrada.path)
+                    continue
+
+                # Resolver posibles conflictos de nombres
+                dest_path = os.path.join(output_folder, _nombre_libre(entrada.name, usados))
+                try:
+                    os.rename(entrada.path, dest_path)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    shutil.move(entrada.path, dest_path)
+
+    # Las carpetas ya están vacías: eliminarlas de las más profundas a la raíz
+    for actual in reversed(visitadas):
+        os.rmdir(actual)
+
+def _ejecutar_7z(zip_paths, destino):
+    """
+    Extrae varios ZIP con una sola ejecución de 7-Zip en la carpeta destino (que se crea).
+    'e' extrae sin las rutas internas (todo queda plano, sin subcarpetas que aplanar después);
+    -an -ai! le pasa la lista de archivos a 7z, que los recorre en el mismo proceso; -aou
+    renombra los archivos repetidos (entre ZIP o entre carpetas) en lugar de sobrescribirlos.
+    """
+    os.makedirs(destino, exist_ok=True)
+    # -mmt=on usa todos los núcleos; -bd -bso0 -bsp0 suprimen la salida y el progreso por archivo
+    subprocess.run(
+        ['7z', 'e', '-an', *[f'-ai!{zip_path}' for zip_path in zip_paths], f'-o{destino}',
+         '-aou', '-mmt=on', '-bd', '-bso0', '-bsp0'],
+        check=True,
+    )
+
+def _extraer_lote_7z(lote, output_folder):
+    """
+    Extrae un lote de ZIP con 7-Zip en una carpeta temporal propia dentro de output_folder
+    (mismo sistema de archivos, así los renombres posteriores son atómicos). Si el lote falla,
+    se repite archivo por archivo, cada uno en su carpeta, para aislar el ZIP con problemas.
+
+    Retorna:
+    list: Carpetas temporales con los archivos extraídos, en el orden de los ZIP.
+    """
+    destino = tempfile.mkdtemp(prefix='.7z-', dir=output_folder)
+    try:
+        _ejecutar_7z(lote, destino)
+        return [destino]
+    except subprocess.CalledProcessError:
+        shutil.rmtree(destino, ignore_errors=True)
+
+    destinos = []
+    for zip_path in lote:
+        destino = tempfile.mkdtemp(prefix='.7z-', dir=output_folder)
+        try:
+            _ejecutar_7z([zip_path], destino)
+            destinos.append(destino)
+        except subprocess.CalledProcessError as e:
+            print(f"Error al descomprimir {os.path.basename(zip_path)}: {e}")
+            shutil.rmtree(destino, ignore_errors=True)
+    return destinos
+
+def _extraer_con_7z(zip_paths, output_folder, usados):
+    """
+    Extrae los ZIP con 7-Zip. Solo se usa para archivos con métodos de compresión
+    que zipfile no soporta (por ejemplo, Deflate64).
+    Los ZIP se reparten en lotes de hasta LOTE_7Z (una ejecución de 7z por lote) y los lotes
+    se extraen en paralelo, con a lo sumo la mitad de los núcleos (el trabajo lo hace el
+    proceso 7z, por eso alcanza con hilos). Al final, las carpetas de cada lote se aplanan
+    en la carpeta de salida, en orden y en un solo hilo, para resolver los nombres repetidos.
+    """
+    num_procesos = max(1, (os.cpu_count() or 1) // 2)
+    tamano_lote = min(LOTE_7Z, -(-len(zip_paths) // num_procesos))
+    lotes = [zip_paths[inicio:inicio + tamano_lote] for inicio in range(0, len(zip_paths), tamano_lote)]
+
+    with ThreadPoolExecutor(max_workers=num_procesos) as executor:
+        futuros = [executor.submit(_extraer_lote_7z, lote, output_folder) for lote in lotes]
+        for futuro in futuros:
+            for destino in futuro.result():
+                _aplanar_carpeta(destino, output_folder, usados)
+
+def decompress_zip_files(input_folder, output_folder, selected_files, num_workers=None):
     """
     Descomprime los archivos ZIP seleccionados directamente en la carpeta de salida sin crear subcarpetas.
     Si hay conflictos de nombres, los archivos se renombran automáticamente.
+    La lectura de los encabezados es secuencial; la descompresión de las entradas se reparte
+    en un pool de procesos, en un tramo de entradas por proceso y por ZIP.
     """
-    # Verificar que 7z está instalado
-    if shutil.which('7z') is None:
-        raise EnvironmentError("El programa '7z' no está instalado o no está en el PATH.")
-
     os.makedirs(output_folder, exist_ok=True)
 
-    for zip_file in selected_files:
-        zip_path = os.path.join(input_folder, zip_file)
-        print(f"Procesando archivo: {zip_file}")
+    # Nombres ya presentes en la carpeta de salida y último sufijo asignado a cada uno
+    usados = {nombre: 0 for nombre in os.listdir(output_folder)}
+    num_procesos = num_workers or os.cpu_count() or 1
+
+    with _crear_executor(num_workers) as executor:
+        futuros = {}
+        zips_7z = []
+        for zip_file in selected_files:
+            zip_path = os.path.join(input_folder, zip_file)
+            print(f"Procesando archivo: {zip_file}")
+
+            try:
+                with zipfile.ZipFile(zip_path) as zf:
+                    miembros = [info for info in zf.infolist() if not info.is_dir()]
+
+                if all(info.compress_type in METODOS_ZIP_SOPORTADOS for info in miembros):
+                    # Reservar el nombre de destino aquí para que los procesos no compitan por él
+                    tareas = [
+                        (info, os.path.join(output_folder, _nombre_libre(os.path.basename(info.filename), usados)))
+                        for info in miembros
+                    ]
+                    # Repartir las entradas en un tramo por proceso: cada tramo abre el ZIP una sola vez
+                    tamano_tramo = max(1, -(-len(tareas) // num_procesos))
+                    for inicio in range(0, len(tareas), tamano_tramo):
+                        tramo = tareas[inicio:inicio + tamano_tramo]
+                        futuros[executor.submit(_extraer_miembros, zip_path, tramo)] = zip_file
+                else:
+                    zips_7z.append(zip_path)
+
+            except zipfile.BadZipFile as e:
+                print(f"Error al descomprimir {zip_file}: {e}")
+            except Exception as e:
+                print(f"Error procesando {zip_file}: {e}")
+
+        # Los ZIP que zipfile no puede descomprimir se extraen con 7-Zip en lotes, mientras el
+        # pool termina las extracciones en curso
+        if zips_7z:
+            # Sin 7z estos ZIP no se pueden extraer: el error llega a main antes de que se
+            # actualice el último archivo procesado, para que se reintenten en la próxima ejecución
+            if shutil.which('7z') is None:
+                raise EnvironmentError("El programa '7z' no está instalado o no está en el PATH.")
+            try:
+                _extraer_con_7z(zips_7z, output_folder, usados)
+            except Exception as e:
+                print(f"Error al descomprimir con 7z: {e}")
+
+        # Esperar a que se completen todas las extracciones
+        for futuro in as_completed(futuros):
+            try:
+                futuro.result()
+            except Exception as e:
+                print(f"Error al descomprimir {futuros[futuro]}: {e}")
+
+def _es_canal_tiempo(nombre_canal):
+    """
+    Indica si el canal contiene las marcas de tiempo de la adquisición.
+    """
+    nombre = nombre_canal.lower()
+    return nombre == "time" or nombre.startswith("date")
 
+def _corregir_tiempo(datos):
+    """
+    Convierte los datos de un canal de tiempo a datetime64 y les resta 3 horas.
+    Si nptdms ya devuelve marcas nativas (datetime64) no se realiza ningún parseo.
+    Las marcas en texto ISO se parsean con NumPy (en C); pandas solo se usa como
+    respaldo para textos que NumPy no reconoce.
+    """
+    if datos.dtype.kind != 'M':
+        # Convertir los datos de tiempo sin alterar la zona horaria
         try:
-            # Descomprimir utilizando 7zip directamente en la carpeta de salida
-            subprocess.run(['7z', 'x', zip_path, f'-o{output_folder}', '-y'], check=True)
-
-            # Resolver posibles conflictos de nombres
-            for root, _, files in os.walk(output_folder):
-                for file in files:
-                    src_path = os.path.join(root, file)
-                    dest_path = os.path.join(output_folder, file)
-
-                    # Renombrar si hay conflictos de nombres
-                    if src_path != dest_path:
-                        if os.path.exists(dest_path):
-                            base, ext = os.path.splitext(file)
-                            counter = 1
-                            while os.path.exists(dest_path):
-                                dest_path = os.path.join(output_folder, f"{base}_{counter}{ext}")
-                                counter += 1
-                        shutil.move(src_path, dest_path)
-
-            # Eliminar subcarpetas vacías
-            for root, dirs, _ in os.walk(output_folder):
-                for dir in dirs:
-                    dir_path = os.path.join(root, dir)
-                    if not os.listdir(dir_path):  # Solo eliminar si está vacía
-                        shutil.rmtree(dir_path)
+            datos = np.asarray(datos, dtype='datetime64[us]')
+        except ValueError:
+            datos = pd.to_datetime(datos, format='%Y-%m-%d %H:%M:%S.%f', errors='coerce').to_numpy()
 
-        except subprocess.CalledProcessError as e:
-            print(f"Error al descomprimir {zip_file}: {e}")
-        except Exception as e:
-            print(f"Error procesando {zip_file}: {e}")
+    # Corregir la hora (restar 3 horas) directamente sobre el arreglo de NumPy
+    return datos - np.timedelta64(3, 'h')
+
+def _tiempo_de_canal(canal, *rango):
+    """
+    Lee (entero o el tramo offset, length de rango) y corrige un canal de tiempo explícito.
+    Sus marcas se devuelven como datetime64[us], con los microsegundos del canal (como el
+    '%f' del CSV original) y la misma unidad que el tiempo de forma de onda.
+    """
+    return _corregir_tiempo(canal.read_data(*rango, scaled=True)).astype('datetime64[us]')
 
-def convertir_tdms_a_csv(archivo_tdms, carpeta_salida):
+def _esquema_tdms(canales):
+    """
+    Devuelve (índice del canal de tiempo, índices de los canales de datos, dtype de los datos)
+    para la lista de canales. El esquema se guarda en caché por proceso, ya que todos los
+    archivos de una adquisición suelen tener el mismo conjunto de canales.
+    """
+    clave = tuple((canal.name, canal.dtype.str) for canal in canales)
+    if clave not in _ESQUEMAS_TDMS:
+        indice_tiempo = next((i for i, canal in enumerate(canales) if _es_canal_tiempo(canal.name)), None)
+        indices_datos = [
+            i for i, canal in enumerate(canales)
+            if i != indice_tiempo and canal.dtype.kind not in 'MOSU'
+        ]
+        dtype = np.result_type(*[canales[i].dtype for i in indices_datos]) if indices_datos else np.float64
+        _ESQUEMAS_TDMS[clave] = (indice_tiempo, indices_datos, dtype)
+    return _ESQUEMAS_TDMS[clave]
+
+def _tiempo_de_forma_de_onda(archivo_tdms, canales, indices_datos):
+    """
+    Reconstruye las marcas de tiempo a partir de las propiedades de forma de onda
+    (wf_start_time, wf_increment) del primer canal de datos, para archivos sin canal de tiempo.
+    El vector se calcula con NumPy a partir de esas propiedades, sin leer datos adicionales,
+    y conserva los microsegundos (con wf_increment < 1 ms varias muestras caen en el mismo
+    milisegundo).
+    """
+    if not indices_datos:
+        raise ValueError(f"{archivo_tdms} no tiene un canal de tiempo.")
     try:
-        # Leer el archivo TDMS
-        tdms_file = TdmsFile.read(archivo_tdms)
+        tiempo = canales[indices_datos[0]].time_track(absolute_time=True, accuracy='us')
+    except KeyError:
+        raise ValueError(f"{archivo_tdms} no tiene un canal de tiempo ni propiedades de forma de onda.")
+    return _corregir_tiempo(tiempo).astype('datetime64[us]')
+
+def _leer_canales_tdms(archivo_tdms):
+    """
+    Lee el único grupo de un TDMS en formato de columnas (SoA): un vector de tiempo corregido y
+    una matriz preasignada en orden Fortran (cada canal contiguo) donde se copia cada canal.
 
+    Retorna:
+    tuple: (nombre del canal de tiempo, tiempo, nombres de los canales de datos, datos)
+    """
+    # Abrir el archivo TDMS en modo streaming: los canales se leen bajo demanda
+    with TdmsFile.open(archivo_tdms) as tdms_file:
         # Obtener el único grupo (si solo hay uno)
-        grupo = tdms_file.groups()[0]
+        canales = tdms_file.groups()[0].channels()
+        indice_tiempo, indices_datos, dtype = _esquema_tdms(canales)
+        if indice_tiempo is not None:
+            # Si el canal tiene datos de tiempo, conviértelo explícitamente
+            nombre_tiempo = canales[indice_tiempo].name
+            tiempo = _tiempo_de_canal(canales[indice_tiempo])
+        else:
+            nombre_tiempo = "Time"
+            tiempo = _tiempo_de_forma_de_onda(archivo_tdms, canales, indices_datos)
 
-        # Crear un diccionario para almacenar los datos de los canales
-        data_dict = {}
+        # Copiar cada canal en su columna de la matriz, sin listas ni copias intermedias
+        datos = np.empty((len(tiempo), len(indices_datos)), dtype=dtype, order='F')
+        for columna, indice in enumerate(indices_datos):
+            valores = canales[indice].read_data(scaled=True)
+            if len(valores) != len(tiempo):
+                raise ValueError(f"El canal {canales[indice].name} no tiene la misma longitud que el tiempo.")
+            np.copyto(datos[:, columna], valores)
 
-        for canal in grupo.channels():
-            nombre_canal = canal.name
-            # Si el canal tiene datos de tiempo, conviértelo explícitamente
-            if canal.name.lower() == "time" or canal.name.lower().startswith("date"):
-                # Convertir los datos de tiempo sin alterar la zona horaria
-                datos_tiempo = pd.to_datetime(canal.data, format='%Y-%m-%d %H:%M:%S.%f', errors='coerce')
-                
-                # Corregir la hora (restar 3 horas)
-                datos_tiempo_corregidos = datos_tiempo - pd.Timedelta(hours=3)
-                
-                # Almacenar los datos corregidos en el diccionario
-                data_dict[nombre_canal] = datos_tiempo_corregidos
-            else:
-                # Para los demás canales, almacenar los datos sin modificar
-                data_dict[nombre_canal] = canal.data
+    return nombre_tiempo, tiempo, [canales[i].name for i in indices_datos], datos
 
+def _leer_bloques_tdms(archivo_tdms, filas=FILAS_POR_LECTURA):
+    """
+    Igual que _leer_canales_tdms, pero lee los canales por bloques de filas (read_data con
+    offset/length) para no tener nunca el archivo completo en memoria.
 
-        # Crear un DataFrame con los datos
-        df = pd.DataFrame(data_dict)
+    Genera:
+    tuple: (nombre del canal de tiempo, tiempo, nombres de los canales de datos, datos) por bloque
+    """
+    with TdmsFile.open(archivo_tdms) as tdms_file:
+        canales = tdms_file.groups()[0].channels()
+        indice_tiempo, indices_datos, dtype = _esquema_tdms(canales)
+        nombres = [canales[i].name for i in indices_datos]
+        if indice_tiempo is not None:
+            nombre_tiempo = canales[indice_tiempo].name
+            num_filas = len(canales[indice_tiempo])
+            tiempo_onda = None
+        else:
+            nombre_tiempo = "Time"
+            tiempo_onda = _tiempo_de_forma_de_onda(archivo_tdms, canales, indices_datos)
+            num_filas = len(tiempo_onda)
+
+        for canal in (canales[i] for i in indices_datos):
+            if len(canal) != num_filas:
+                raise ValueError(f"El canal {canal.name} no tiene la misma longitud que el tiempo.")
+
+        for inicio in range(0, num_filas, filas):
+            largo = min(filas, num_filas - inicio)
+            if tiempo_onda is None:
+                tiempo = _tiempo_de_canal(canales[indice_tiempo], inicio, largo)
+            else:
+                tiempo = tiempo_onda[inicio:inicio + largo]
 
-        # Crear el nombre del archivo CSV (el mismo nombre que el archivo TDMS, pero con extensión .csv)
-        nombre_archivo_csv = os.path.splitext(os.path.basename(archivo_tdms))[0] + ".csv"
-        ruta_archivo_csv = os.path.join(carpeta_salida, nombre_archivo_csv)
+            datos = np.empty((largo, len(indices_datos)), dtype=dtype, order='F')
+            for columna, indice in enumerate(indices_datos):
+                np.copyto(datos[:, columna], canales[indice].read_data(inicio, largo, scaled=True))
 
-        # Guardar el DataFrame como CSV
-        df.to_csv(ruta_archivo_csv, index=False, sep=';')
+            yield nombre_tiempo, tiempo, nombres, datos
 
+def _eliminar_tdms(archivo_tdms):
+    """
+    Elimina un TDMS ya convertido junto con su archivo .tdms_index, si existe.
+    """
+    os.remove(archivo_tdms)
+    archivo_tdms_index = archivo_tdms + '_index'
+    if os.path.exists(archivo_tdms_index):
+        os.remove(archivo_tdms_index)
 
-        # Verificar que el archivo CSV existe antes de eliminar los archivos TDMS
-        if os.path.exists(ruta_archivo_csv):
-            os.remove(archivo_tdms)
+def _lotes_tdms(archivo_tdms):
+    """
+    Genera los bloques de _leer_bloques_tdms como lotes de Arrow (RecordBatch), construidos
+    directamente desde las columnas, sin copias intermedias.
+    """
+    for nombre_tiempo, tiempo, nombres, datos in _leer_bloques_tdms(archivo_tdms):
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(tiempo)] + [pa.array(datos[:, i]) for i in range(datos.shape[1])],
+            names=[nombre_tiempo] + nombres,
+        )
 
-            # Eliminar el archivo .tdms_index si existe
-            archivo_tdms_index = archivo_tdms + '_index'
-            if os.path.exists(archivo_tdms_index):
-                os.remove(archivo_tdms_index)
-        else:
-            print(f"Error: No se pudo crear el archivo CSV {ruta_archivo_csv}. TDMS no eliminado.")
+def _convertir_tdms(archivo_tdms, carpeta_salida, extension, crear_escritor):
+    """
+    Escribe un TDMS bloque a bloque en carpeta_salida (mismo nombre, con la extensión dada)
+    usando el escritor que devuelve crear_escritor(salida, esquema), y elimina el TDMS
+    solo si el archivo de salida se creó.
+    """
+    # Crear el nombre del archivo de salida (el mismo nombre que el archivo TDMS, con la nueva extensión)
+    nombre_archivo = os.path.splitext(os.path.basename(archivo_tdms))[0] + extension
+    ruta_archivo = os.path.join(carpeta_salida, nombre_archivo)
+
+    # Guardar el archivo bloque a bloque, para no tener nunca el TDMS completo en memoria
+    with pa.output_stream(ruta_archivo, buffer_size=TAMANO_BUFFER_ESCRITURA) as salida:
+        escritor = None
+        for lote in _lotes_tdms(archivo_tdms):
+            if escritor is None:
+                escritor = crear_escritor(salida, lote.schema)
+            escritor.write_batch(lote)
+        if escritor is not None:
+            escritor.close()
+
+    # Verificar que el archivo existe antes de eliminar los archivos TDMS
+    if os.path.exists(ruta_archivo):
+        _eliminar_tdms(archivo_tdms)
+    else:
+        print(f"Error: No se pudo crear el archivo {ruta_archivo}. TDMS no eliminado.")
+
+def convertir_tdms_a_feather(archivo_tdms, carpeta_salida):
+    """
+    Convierte un TDMS a un archivo Feather (Arrow IPC) por hora, con la columna de tiempo y
+    un canal de datos por columna. Es el formato intermedio de --emit-csv: las columnas se
+    escriben en binario, sin formatear ni volver a parsear texto.
+    """
+    try:
+        _convertir_tdms(archivo_tdms, carpeta_salida, ".feather", pa.ipc.new_file)
+    except Exception as e:
+        print(f"Error al convertir TDMS a Feather: {e}")
+
+def convertir_tdms_a_parquet(archivo_tdms, carpeta_salida):
+    """
+    Agrega los datos de un TDMS al dataset Parquet particionado por día dentro de
+    carpeta_salida/parquet (una carpeta 'Date=AAAA-MM-DD' por día, compresión zstd).
+    Cada TDMS escribe sus propios archivos, por lo que ejecuciones sucesivas completan
+    los días ya existentes sin reescribirlos; los lectores ordenan por tiempo al leer.
+    """
+    try:
+        nombre_tiempo, tiempo, nombres, datos = _leer_canales_tdms(archivo_tdms)
+
+        tabla = pa.Table.from_arrays(
+            [pa.array(tiempo)]
+            + [pa.array(datos[:, i]) for i in range(datos.shape[1])]
+            + [pa.array(tiempo.astype('datetime64[D]'))],
+            names=[nombre_tiempo] + nombres + ['Date'],
+        )
+
+        base = os.path.splitext(os.path.basename(archivo_tdms))[0]
+        pq.write_to_dataset(
+            tabla,
+            root_path=os.path.join(carpeta_salida, CARPETA_PARQUET),
+            partition_cols=['Date'],
+            basename_template=f"{base}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=True,
+            row_group_size=1_048_576,
+        )
+
+        # Eliminar el TDMS (y su índice) una vez escritos sus datos
+        _eliminar_tdms(archivo_tdms)
 
     except Exception as e:
-        print(f"Error al convertir TDMS a CSV: {e}")
+        print(f"Error al convertir TDMS a Parquet: {e}")
 
 def procesar_archivos_tdms(carpeta_tdms, carpeta_salida):
     # Verificar que la carpeta existe
@@ -129,22 +549,29 @@ def procesar_archivos_tdms(carpeta_tdms, carpeta_salida):
     # Iterar sobre todos los archivos TDMS
     for archivo in archivos_tdms:
         archivo_tdms = os.path.join(carpeta_tdms, archivo)
-        convertir_tdms_a_csv(archivo_tdms, carpeta_salida)
+        convertir_tdms_a_feather(archivo_tdms, carpeta_salida)
 
-def procesar_archivos_tdms_paralelo(carpeta_tdms, num_workers=4):
+def procesar_archivos_tdms_paralelo(carpeta_tdms, carpeta_salida=None, num_workers=4, convertir=convertir_tdms_a_feather):
     """
     Procesa los archivos TDMS en paralelo para reducir el tiempo total de ejecución.
     Muestra una barra de progreso dinámica.
     
     Parámetros:
     carpeta_tdms (str): Carpeta donde se encuentran los archivos TDMS.
-    num_workers (int): Número de hilos (o procesos) a usar para el procesamiento paralelo.
+    carpeta_salida (str): Carpeta donde se escriben los resultados (por defecto, la misma carpeta_tdms).
+    num_workers (int): Número de procesos a usar para el procesamiento paralelo.
+    convertir (callable): Función de conversión por archivo (convertir_tdms_a_feather o convertir_tdms_a_parquet).
     """
     # Verificar que la carpeta existe
     if not os.path.exists(carpeta_tdms):
         print(f"La carpeta {carpeta_tdms} no existe.")
         return
 
+    # Verificar que la carpeta de salida existe, si no, crearla
+    if carpeta_salida is None:
+        carpeta_salida = carpeta_tdms
+    os.makedirs(carpeta_salida, exist_ok=True)
+
     # Lista de archivos TDMS en la carpeta
     archivos_tdms = [
         os.path.join(carpeta_tdms, archivo)
@@ -158,106 +585,180 @@ def procesar_archivos_tdms_paralelo(carpeta_tdms, num_workers=4):
     print(f"Número de WORKERS: {num_workers}")
     # Crear una barra de progreso
     with tqdm(total=len(archivos_tdms), desc="Procesando archivos TDMS", unit="archivo") as barra:
-        # Crear un pool de hilos para procesamiento paralelo
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            # Enviar tareas al pool
-            futuros = {
-                executor.submit(convertir_tdms_a_csv, archivo, carpeta_tdms): archivo
-                for archivo in archivos_tdms
-            }
-
-            # Esperar a que se completen todas las tareas
-            for futuro in as_completed(futuros):
-                archivo = futuros[futuro]
-                try:
-                    futuro.result()  # Obtener el resultado de la tarea
-                except Exception as e:
-                    print(f"\nError procesando {archivo}: {e}")  # Mostrar errores en una nueva línea
-                finally:
+        # Crear un pool de procesos para procesamiento paralelo (evita la contención del GIL)
+        with _crear_executor(num_workers) as executor:
+            # Enviar las tareas por lotes: cada envío al pool lleva varias conversiones
+            resultados = executor.map(
+                convertir, archivos_tdms, repeat(carpeta_salida),
+                chunksize=_tamano_lote(len(archivos_tdms), num_workers),
+            )
+
+            # Esperar a que se completen todas las tareas (cada conversión informa sus propios errores)
+            try:
+                for _ in resultados:
                     barra.update(1)  # Incrementar la barra de progreso
+            except Exception as e:
+                print(f"\nError procesando archivos TDMS: {e}")  # Mostrar errores en una nueva línea
 
-def ordenar_y_agrupado_por_dia(input_folder, procesar_incompleto=False):
+def _carpeta_incompletos():
     """
-    Procesa archivos CSV por hora, agrupa por día y maneja archivos incompletos.
-    Si un archivo está incompleto, se guarda en una carpeta temporal. Luego se completa
-    con los datos de la siguiente ejecución y se mueve a la carpeta de salida.
-    
-    Parámetros:
-    input_folder (str): Carpeta donde se encuentran los archivos CSV.
+    Devuelve la carpeta 'temp' (junto al script) donde se guardan los días incompletos
+    entre ejecuciones, creándola si no existe.
     """
     # Obtener la ruta donde se encuentra el script
     script_folder = os.path.dirname(os.path.abspath(__file__))
 
     # Crear la carpeta temporal en la misma ruta del script
     temp_folder = os.path.join(script_folder, 'temp')
+    os.makedirs(temp_folder, exist_ok=True)
+    return temp_folder
+
+def _opciones_csv_arrow():
+    """
+    Opciones de lectura de Arrow para los CSV intermedios (bloques grandes, separador ';'
+    y columna 'Time' en microsegundos).
+    """
+    return (
+        pacsv.ReadOptions(block_size=TAMANO_BLOQUE_LECTURA_CSV),
+        pacsv.ParseOptions(delimiter=';'),
+        pacsv.ConvertOptions(column_types={'Time': pa.timestamp('us')}),
+    )
+
+def _formato_csv_arrow():
+    """
+    Formato de dataset de Arrow para los CSV intermedios.
+    """
+    read_options, parse_options, convert_options = _opciones_csv_arrow()
+    return ds.CsvFileFormat(parse_options=parse_options, convert_options=convert_options, read_options=read_options)
+
+def _ordenar_por_tiempo(tabla):
+    """
+    Ordena la tabla por la columna 'Time' (orden estable). Como los TDMS se adquieren en forma
+    secuencial, lo habitual es que ya esté ordenada: eso se verifica en una pasada lineal y
+    en ese caso la tabla se devuelve sin copiarla.
+    """
+    tiempo = pc.cast(tabla['Time'], pa.int64()).to_numpy(zero_copy_only=False)
+    if tabla['Time'].null_count == 0 and np.all(tiempo[1:] >= tiempo[:-1]):
+        return tabla
+    return tabla.sort_by('Time')
+
+def ordenar_y_agrupado_por_dia(input_folder, procesar_incompleto=False, unidad="05", dtype='float32', compress=False):
+    """
+    Procesa archivos por hora (Feather o CSV), agrupa por día y genera, para cada día, un CSV
+    diario ordenado y su .mat (ambos quedan en la carpeta). Si un día está incompleto, su CSV
+    se guarda en una carpeta temporal; luego se completa con los datos de la siguiente
+    ejecución y se genera en la carpeta de salida.
     
-    # Verificar si la carpeta temporal existe, si no la creamos
-    if not os.path.exists(temp_folder):
-        os.makedirs(temp_folder)
+    Parámetros:
+    input_folder (str): Carpeta donde se encuentran los archivos por hora.
+    procesar_incompleto (bool): Si es True, también se generan el CSV y el .mat del último día incompleto.
+    unidad (str): Unidad que se agrega al nombre de los archivos .mat.
+    dtype (str): Precisión de los datos en el .mat (ver _cuantizar_datos).
+    compress (bool): Si es True, comprime los datos dentro del .mat (más lento).
+    """
+    temp_folder = _carpeta_incompletos()
 
     # Mover los archivos temporales a la carpeta de entrada
     for temp_file_name in os.listdir(temp_folder):
         temp_file_path = os.path.join(temp_folder, temp_file_name)
-        if os.path.exists(temp_file_path):
+        if temp_file_name.endswith(".csv"):
             # El archivo temporal se mueve directamente sin cambiar su nombre
             shutil.move(temp_file_path, os.path.join(input_folder, temp_file_name))
 
-    # Obtener la lista de todos los archivos CSV en la carpeta de entrada
-    csv_files = [
-        os.path.join(root, file)
-        for root, _, files in os.walk(input_folder)
-        for file in files if file.endswith(".csv")
-    ]
-
-    # Verificar si hay archivos CSV
-    if not csv_files:
-        print("No se encontraron archivos CSV en la carpeta especificada.")
+    # Obtener la lista de todos los archivos por hora (y días incompletos) en la carpeta de entrada
+    feather_files, csv_files = [], []
+    for root, _, files in os.walk(input_folder):
+        for file in files:
+            if file.endswith(".feather"):
+                feather_files.append(os.path.join(root, file))
+            elif file.endswith(".csv"):
+                csv_files.append(os.path.join(root, file))
+
+    # Verificar si hay archivos
+    if not feather_files and not csv_files:
+        print("No se encontraron archivos CSV ni Feather en la carpeta especificada.")
         return
 
-    # Crear un diccionario para almacenar temporalmente los datos por día
-    datos_por_dia = {}
-
-    # Procesar cada archivo CSV individualmente
-    for file in csv_files:
-        # Leer el archivo CSV por partes para manejar archivos grandes
-        for chunk in pd.read_csv(file, delimiter=";", decimal=",", parse_dates=['Time'], chunksize=10000):
-            # Ordenar los datos por fecha y hora
-            chunk.sort_values(by='Time', inplace=True)
-
-            # Extraer la fecha de la columna 'Time'
-            chunk['Date'] = chunk['Time'].dt.date
-
-            # Agrupar los datos por día y agregar al diccionario
-            for date, group in chunk.groupby('Date'):
-                if date not in datos_por_dia:
-                    datos_por_dia[date] = []
-                datos_por_dia[date].append(group)
-
-    # Guardar los datos agrupados por día
-    for date, groups in tqdm(datos_por_dia.items(), desc="Concatenando archivos por día", unit="día"):
-        # Concatenar los grupos del mismo día
-        daily_data = pd.concat(groups, ignore_index=True)
-
-        # Eliminar la columna 'Date' antes de guardar
-        daily_data.drop('Date', axis=1, inplace=True)
-
-        # Crear el nombre del archivo de salida
+    # Declarar todos los archivos como un único dataset de Arrow (lectura en streaming); los CSV
+    # (días incompletos de la ejecución anterior) se leen con el esquema de los Feather. Los días
+    # incompletos van primero y los archivos por hora en orden cronológico, así los días se
+    # arman ya ordenados
+    feather_files.sort()
+    csv_files.sort()
+    formato_csv = _formato_csv_arrow()
+    if feather_files:
+        dataset_feather = ds.dataset(feather_files, format='feather')
+        datasets = [dataset_feather]
+        if csv_files:
+            datasets.insert(0, ds.dataset(csv_files, format=formato_csv, schema=dataset_feather.schema))
+        dataset = ds.dataset(datasets)
+    else:
+        dataset = ds.dataset(csv_files, format=formato_csv)
+    opciones_escritura = pacsv.WriteOptions(delimiter=';')
+
+    # Un escritor por día (con su archivo de salida con buffer), abierto la primera vez
+    # que aparece una fila de ese día
+    escritores = {}
+    try:
+        # Recorrer los archivos por lotes y añadir cada lote al archivo de su día,
+        # de modo que en memoria solo se mantiene un lote a la vez
+        for lote in dataset.to_batches():
+            fechas = pc.cast(lote.column('Time'), pa.date32())
+            fechas_lote = pc.unique(fechas).to_pylist()
+            for fecha in fechas_lote:
+                # Las filas sin marca de tiempo válida no pertenecen a ningún día
+                if fecha is None:
+                    continue
+                if fecha not in escritores:
+                    output_file = os.path.join(input_folder, f"{fecha}.csv")
+                    salida = pa.output_stream(output_file, buffer_size=TAMANO_BUFFER_ESCRITURA)
+                    escritores[fecha] = (salida, pacsv.CSVWriter(salida, lote.schema, write_options=opciones_escritura))
+                # Lo habitual es que todo el lote sea de un mismo día: se escribe sin filtrarlo (sin copias)
+                if len(fechas_lote) == 1:
+                    escritores[fecha][1].write_batch(lote)
+                else:
+                    escritores[fecha][1].write_batch(lote.filter(pc.equal(fechas, pa.scalar(fecha, pa.date32()))))
+    finally:
+        for salida, escritor in escritores.values():
+            escritor.close()
+            salida.close()
+
+    # Ordenar y verificar cada archivo del día; el archivo se lee mapeado en memoria, sin copiarlo
+    # antes a un buffer propio (la tabla resultante no referencia el mapeo)
+    sistema_mmap = pafs.LocalFileSystem(use_mmap=True)
+    for date in tqdm(sorted(escritores), desc="Ordenando archivos por día", unit="día"):
         output_file = os.path.join(input_folder, f"{date}.csv")
 
-        # Guardar el archivo CSV del día
-        daily_data.to_csv(output_file, sep=";", decimal=",", index=False)
+        # Releer el archivo del día y ordenar los datos por fecha y hora (solo si no llegaron en orden)
+        daily_data = _ordenar_por_tiempo(ds.dataset(output_file, format=formato_csv, filesystem=sistema_mmap).to_table())
 
         # Verificar si el archivo está completo hasta las 23:59:59
-        last_time = daily_data['Time'].max()
-        if last_time.hour != 23 or last_time.minute != 59 or last_time.second != 59:
-            # Mover el archivo incompleto a la carpeta temporal
+        last_time = pc.max(daily_data['Time']).as_py()
+        incompleto = last_time.hour != 23 or last_time.minute != 59 or last_time.second != 59
+
+        # Reescribir el archivo del día ya ordenado: es el CSV diario que se entrega junto al .mat
+        with pa.output_stream(output_file, buffer_size=TAMANO_BUFFER_ESCRITURA) as salida:
+            pacsv.write_csv(daily_data, salida, opciones_escritura)
+
+        if incompleto:
+            # Mover el archivo incompleto a la carpeta temporal (copiarlo solo si también se procesa)
             temp_file = os.path.join(temp_folder, f"{date}_temp.csv")
-            shutil.copy(output_file, temp_file)
             if not procesar_incompleto:
-                os.remove(output_file)
+                shutil.move(output_file, temp_file)
+                continue
+            # Enlace duro (sin escribir datos): ninguno de los dos nombres se modifica en el lugar,
+            # solo se leen y se eliminan; si el sistema de archivos no lo permite, se copia
+            try:
+                os.link(output_file, temp_file)
+            except OSError:
+                shutil.copy(output_file, temp_file)
+
+        # Guardar el día como .mat directamente desde la tabla ya ordenada en memoria
+        _guardar_mat_v73(os.path.join(input_folder, _nombre_mat(str(date), unidad)),
+                         _variables_mat(daily_data, dtype), compress)
 
-    # Eliminar los archivos CSV procesados
-    eliminar_archivos_csv(csv_files)
+    # Eliminar los archivos por hora procesados
+    eliminar_archivos_csv(feather_files + csv_files)
 
 
 def eliminar_archivos_csv(csv_files):
@@ -265,67 +766,379 @@ def eliminar_archivos_csv(csv_files):
         if os.path.exists(file):
             os.remove(file)
 
-def csv_to_mat(folder_path, unidad = "05"):
+def _bloques_hdf5(forma):
     """
-    Convierte todos los archivos CSV en la carpeta especificada a formato .mat.
-    La columna 'Time' se convierte a formato epoch con precisión en milisegundos.
-    Después de la conversión, se eliminan los archivos CSV originales.
-    
-    Parámetros:
-    folder_path (str): Ruta de la carpeta que contiene los archivos CSV.
+    Tamaño de bloque (chunk) HDF5: hasta FILAS_POR_BLOQUE muestras a lo largo del eje
+    de muestras (el más largo) y el resto de las dimensiones completas.
     """
-    # Verificar si la carpeta existe
-    if not os.path.exists(folder_path):
-        print(f"La carpeta {folder_path} no existe.")
+    eje = int(np.argmax(forma))
+    return tuple(min(d, FILAS_POR_BLOQUE) if i == eje else d for i, d in enumerate(forma))
+
+def _opciones_hdf5(forma, compress):
+    """
+    Opciones de creación de un dataset HDF5: escritura por bloques y, opcionalmente,
+    compresión deflate (gzip) nivel 1, el único filtro que MATLAB lee de forma nativa.
+    """
+    opciones = {'chunks': _bloques_hdf5(forma)}
+    if compress:
+        opciones.update(compression='gzip', compression_opts=1, shuffle=True)
+    return opciones
+
+def _escribir_cabecera_mat_v73(output_file):
+    """
+    Escribe en el bloque de usuario del HDF5 la cabecera que MATLAB usa para reconocer un .mat v7.3.
+    """
+    texto = f"MATLAB 7.3 MAT-file, Platform: {sys.platform}, Created on: {time.strftime('%a %b %d %H:%M:%S %Y')} HDF5 schema 1.00 ."
+    cabecera = texto.encode('ascii').ljust(116, b' ') + bytes(8) + b'\x00\x02IM'
+    with open(output_file, 'r+b') as f:
+        f.write(cabecera)
+
+def _escribir_variable_mat(destino, nombre, valor, compress=False):
+    """
+    Escribe una variable de MATLAB en un archivo (o grupo) HDF5 abierto: los textos como 'char'
+    (UTF-16, un carácter por elemento), los diccionarios como 'struct' (un grupo con un campo
+    por clave) y el resto como arreglos numéricos.
+    MATLAB lee los datasets en orden de columnas, por eso cada arreglo se guarda transpuesto.
+    """
+    if isinstance(valor, dict):
+        grupo = destino.create_group(nombre)
+        grupo.attrs['MATLAB_class'] = np.bytes_('struct')
+        grupo.attrs.create('MATLAB_fields', [np.array(list(campo), dtype='S1') for campo in valor],
+                           dtype=h5py.vlen_dtype(np.dtype('S1')))
+        for campo, valor_campo in valor.items():
+            _escribir_variable_mat(grupo, campo, valor_campo, compress)
         return
-    
-    # Obtener todos los archivos CSV en la carpeta
-    csv_files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
 
-    if not csv_files:
-        print(f"No se encontraron archivos CSV en la carpeta {folder_path}.")
+    if isinstance(valor, str):
+        dataset = destino.create_dataset(nombre, data=np.array([[ord(c) for c in valor]], dtype=np.uint16).T)
+        dataset.attrs['MATLAB_class'] = np.bytes_('char')
+        dataset.attrs['MATLAB_int_decode'] = np.int32(2)
         return
 
-    for csv_file in tqdm(csv_files, desc="Convirtiendo archivos", unit="archivo"):
-        input_file = os.path.join(folder_path, csv_file)
-        # output_file = os.path.join(folder_path, f"{os.path.splitext(csv_file)[0].replace('-', '.')}-u{unidad}.mat")
-        # Divide el nombre del archivo y elimina los ceros a la izquierda de la fecha
-        file_name = os.path.splitext(csv_file)[0]  # Obtiene el nombre sin extensión
-        parts = file_name.split('-')  # Divide por guiones
+    arreglo = np.atleast_2d(valor).T
+    clase = CLASES_MATLAB[arreglo.dtype.name]
+    if arreglo.dtype == np.bool_:
+        arreglo = arreglo.view(np.uint8)  # MATLAB guarda los 'logical' como uint8
+    opciones = _opciones_hdf5(arreglo.shape, compress) if arreglo.size else {}
+    dataset = destino.create_dataset(nombre, data=arreglo, **opciones)
+    dataset.attrs['MATLAB_class'] = np.bytes_(clase)
 
-        # Procesa las partes de la fecha:
-        # 1. Elimina los dos primeros dígitos del año.
-        # 2. Elimina los ceros a la izquierda de los demás números.
-        parts[0] = parts[0][2:]  # Elimina los dos primeros dígitos del año
-        parts = [str(int(part)) if part.isdigit() else part for part in parts]
+def _guardar_mat_v73(output_file, variables, compress=False):
+    """
+    Guarda las variables en un archivo .mat v7.3 (HDF5) con escritura por bloques.
+    """
+    with h5py.File(output_file, 'w', userblock_size=512) as f:
+        for nombre, valor in variables.items():
+            _escribir_variable_mat(f, nombre, valor, compress)
 
-        # Une las partes de nuevo con puntos
-        formatted_name = '.'.join(parts)
+    _escribir_cabecera_mat_v73(output_file)
 
-        # Genera el nombre del archivo final
-        output_file = os.path.join(folder_path, f"{formatted_name}-u{unidad}.mat")
+def _nombre_mat(fecha, unidad):
+    """
+    Genera el nombre del archivo .mat de un día a partir de la fecha 'AAAA-MM-DD'.
+    Por ejemplo, '2025-02-01' con la unidad '05' da '25.2.1-u05.mat'.
+    """
+    # Divide el nombre del archivo y elimina los ceros a la izquierda de la fecha
+    parts = fecha.split('-')  # Divide por guiones
 
-        # Imprime el resultado
-        # print(output_file)
-        
-        # Paso 1: Leer el archivo CSV
-        data = pd.read_csv(input_file, delimiter=";", decimal=".")
-        
-        # Paso 2: Convertir la columna 'Time' a formato epoch (segundos desde 1970-01-01) con precisión en milisegundos
-        data["Time"] = pd.to_datetime(data["Time"])  # Convertir a formato datetime
-        data["Time_epoch"] = (data["Time"] - pd.Timestamp("1970-01-01")) / pd.Timedelta("1s")  # Usar fracciones de segundo
-        
-        # Paso 3: Crear el diccionario para guardar en .mat
-        mat_data = {
-            "time_epoch": data["Time_epoch"].values,  # Fechas con milisegundos
-            "data": data.drop(columns=["Time", "Time_epoch"]).values  # Solo los datos numéricos
-        }
-        
-        # Paso 4: Guardar el archivo .mat
-        savemat(output_file, mat_data)
-        
-        # Eliminar el archivo CSV original
-        os.remove(input_file)
+    # Procesa las partes de la fecha:
+    # 1. Elimina los dos primeros dígitos del año.
+    # 2. Elimina los ceros a la izquierda de los demás números.
+    parts[0] = parts[0][2:]  # Elimina los dos primeros dígitos del año
+    parts = [str(int(part)) if part.isdigit() else part for part in parts]
+
+    # Une las partes de nuevo con puntos
+    formatted_name = '.'.join(parts)
+
+    # Genera el nombre del archivo final
+    return f"{formatted_name}-u{unidad}.mat"
+
+def _meta_precision(dtype):
+    """
+    Variable 'meta' del .mat (un struct de MATLAB) que documenta la precisión de 'data'
+    y cómo obtener los valores físicos.
+    """
+    meta = {"precision": CLASES_MATLAB[np.dtype(dtype).name]}
+    if np.dtype(dtype) == np.int16:
+        meta["reconstruccion"] = "double(data).*scale + offset"
+        meta["nan_code"] = np.int16(CODIGO_NAN_INT16)
+    else:
+        meta["reconstruccion"] = "double(data)"
+    return meta
+
+def _cuantizar_datos(datos, dtype):
+    """
+    Reduce la precisión de la matriz de datos (una fila por muestra, un canal por columna).
+
+    Con dtype 'float64' o 'float32' solo convierte el tipo. Con 'int16' cuantiza cada canal
+    en 65535 niveles (-32767..32767) entre su mínimo y su máximo y agrega los vectores 'scale'
+    y 'offset' (uno por canal) para reconstruir en MATLAB: double(data).*scale + offset.
+    Los NaN no son representables en int16 y se guardan como CODIGO_NAN_INT16 (-32768),
+    que ningún valor válido usa; el código queda en meta.nan_code.
+
+    Retorna:
+    dict: Variables a guardar en el .mat ('data', 'meta' y, para int16, 'scale' y 'offset').
+    """
+    if dtype != 'int16':
+        return {"data": datos.astype(dtype, copy=False), "meta": _meta_precision(dtype)}
+
+    if len(datos):
+        vmin = np.nanmin(datos, axis=0).astype(np.float64)
+        vmax = np.nanmax(datos, axis=0).astype(np.float64)
+    else:
+        vmin = vmax = np.zeros(datos.shape[1])
+    scale = (vmax - vmin) / 65534
+    scale[~(scale > 0)] = 1.0  # Canales constantes (o sin datos válidos)
+    offset = vmin + 32767 * scale
+
+    niveles = np.clip(np.rint((datos - offset) / scale), -32767, 32767)
+    return {
+        "data": np.nan_to_num(niveles, nan=CODIGO_NAN_INT16).astype(np.int16),
+        "scale": scale[np.newaxis, :],
+        "offset": offset[np.newaxis, :],
+        "meta": _meta_precision(np.int16),
+    }
+
+def _columnas_a_matriz(columnas, dtype):
+    """
+    Copia columnas de Arrow en una matriz preasignada en orden Fortran (cada canal contiguo),
+    bloque a bloque y sin concatenar ni apilar copias intermedias. Para float32/float64 la
+    matriz ya tiene el tipo final; para int16 se usa float64 y se cuantiza después.
+    """
+    tipo = np.float64 if dtype == 'int16' else dtype
+    num_filas = len(columnas[0]) if columnas else 0
+    datos = np.empty((num_filas, len(columnas)), dtype=tipo, order='F')
+    for j, columna in enumerate(columnas):
+        fila = 0
+        for bloque in columna.chunks:
+            np.copyto(datos[fila:fila + len(bloque), j], bloque.to_numpy(zero_copy_only=False))
+            fila += len(bloque)
+    return datos
+
+def _variables_mat(tabla, dtype='float32'):
+    """
+    Arma las variables del .mat a partir de una tabla de Arrow con la columna 'Time'
+    y un canal de datos por columna.
+    """
+    # Convertir la columna 'Time' a formato epoch (segundos desde 1970-01-01) con precisión en microsegundos
+    tiempo = pc.cast(tabla['Time'], pa.timestamp('us'))
+    time_epoch = pc.cast(tiempo, pa.int64()).to_numpy() / 1e6  # Usar fracciones de segundo
+
+    # Crear el diccionario para guardar en .mat, con los datos en la precisión pedida
+    datos = _columnas_a_matriz(tabla.drop_columns(['Time']).columns, dtype)  # Solo los datos numéricos
+    return {
+        "time_epoch": time_epoch,  # Fechas con microsegundos
+        **_cuantizar_datos(datos, dtype),
+    }
+
+def leer_tdms(archivo_tdms):
+    """
+    Lee un archivo TDMS y devuelve sus datos como arreglos de NumPy, sin pasar por CSV.
+
+    Retorna:
+    tuple: (tiempo, datos) con las marcas de tiempo corregidas (datetime64[us]) y una matriz
+    con un canal de datos por columna.
+    Si el archivo no se puede leer, retorna None.
+    """
+    try:
+        _, tiempo, _, datos = _leer_canales_tdms(archivo_tdms)
+        return tiempo, datos
+
+    except Exception as e:
+        print(f"Error al leer el archivo TDMS {archivo_tdms}: {e}")
+        return None
+
+def _crear_mat_diario(ruta, num_canales, dtype, compress=False):
+    """
+    Crea un .mat v7.3 vacío con datasets redimensionables para ir añadiendo las muestras del día.
+    """
+    with h5py.File(ruta, 'w', userblock_size=512) as f:
+        tiempo = f.create_dataset('time_epoch', shape=(0, 1), maxshape=(None, 1), dtype=np.float64,
+                                  **_opciones_hdf5((FILAS_POR_BLOQUE, 1), compress))
+        tiempo.attrs['MATLAB_class'] = np.bytes_(CLASES_MATLAB['float64'])
+        datos = f.create_dataset('data', shape=(num_canales, 0), maxshape=(num_canales, None), dtype=dtype,
+                                 **_opciones_hdf5((max(num_canales, 1), FILAS_POR_BLOQUE), compress))
+        datos.attrs['MATLAB_class'] = np.bytes_(CLASES_MATLAB[np.dtype(dtype).name])
+        _escribir_variable_mat(f, 'meta', _meta_precision(dtype))
+
+def _anadir_a_mat_diario(f, time_epoch, datos):
+    """
+    Añade un bloque de muestras al final de los datasets de un .mat diario abierto.
+    """
+    inicio = f['time_epoch'].shape[0]
+    fin = inicio + len(time_epoch)
+    f['time_epoch'].resize(fin, axis=0)
+    f['time_epoch'][inicio:fin, 0] = time_epoch
+    f['data'].resize(fin, axis=1)
+    f['data'][:, inicio:fin] = datos.T
+
+def _finalizar_mat_diario(ruta):
+    """
+    Ordena por tiempo el .mat diario si las muestras no llegaron en orden, escribe la cabecera
+    de MATLAB y devuelve la última marca de tiempo del día.
+    """
+    with h5py.File(ruta, 'r+') as f:
+        time_epoch = f['time_epoch'][:, 0]
+        if np.any(np.diff(time_epoch) < 0):
+            orden = np.argsort(time_epoch, kind='stable')
+            f['time_epoch'][:, 0] = time_epoch[orden]
+            f['data'][...] = f['data'][()][:, orden]
+            time_epoch = time_epoch[orden]
+
+    _escribir_cabecera_mat_v73(ruta)
+    return np.datetime64(int(round(time_epoch[-1] * 1e6)), 'us').item()
+
+def _cuantizar_mat_diario(ruta, compress=False):
+    """
+    Reescribe un .mat diario con los datos cuantizados a int16 (ver _cuantizar_datos).
+    Se genera un archivo nuevo para no dejar en el HDF5 el espacio de los datos originales.
+    """
+    with h5py.File(ruta, 'r') as f:
+        time_epoch = f['time_epoch'][:, 0]
+        datos = f['data'][()].T
+    _guardar_mat_v73(ruta, {"time_epoch": time_epoch, **_cuantizar_datos(datos, 'int16')}, compress)
+
+def _tramos_por_dia(dias, invalidos):
+    """
+    Genera (día, filas) para cada día presente en el vector de días (enteros desde 1970-01-01).
+    Si los días están ordenados (lo habitual: un TDMS es una adquisición secuencial), cada día es
+    un tramo contiguo que empieza donde cambia el día y se entrega como slice (vistas, sin copias).
+    Si no, se usa una máscara por día. Las marcas inválidas (NaT) no pertenecen a ningún día.
+    """
+    if not invalidos.any() and np.all(dias[1:] >= dias[:-1]):
+        if not len(dias):
+            return
+        cortes = np.r_[0, np.flatnonzero(np.diff(dias)) + 1, len(dias)].tolist()
+        for inicio, fin in zip(cortes[:-1], cortes[1:]):
+            yield dias[inicio], slice(inicio, fin)
+    else:
+        for dia in np.unique(dias[~invalidos]):
+            yield dia, dias == dia
+
+def procesar_tdms_a_mat(carpeta_tdms, unidad="05", procesar_incompleto=False, num_workers=4, compress=False,
+                        dtype='float32'):
+    """
+    Convierte los archivos TDMS de la carpeta directamente en archivos .mat diarios,
+    sin archivos CSV intermedios. Las muestras de cada día se van añadiendo a un
+    .mat v7.3 redimensionable a medida que los procesos terminan de leer cada TDMS.
+    Los días incompletos se guardan en la carpeta temporal y se completan en la
+    siguiente ejecución.
+
+    Parámetros:
+    carpeta_tdms (str): Carpeta donde se encuentran los archivos TDMS.
+    unidad (str): Unidad que se agrega al nombre de los archivos .mat.
+    procesar_incompleto (bool): Si es True, también se genera el .mat del último día incompleto.
+    num_workers (int): Número de procesos a usar para leer los TDMS.
+    compress (bool): Si es True, comprime los datos dentro del .mat (más lento).
+    dtype (str): Precisión de los datos en el .mat: 'float64', 'float32' o 'int16' (ver _cuantizar_datos).
+    """
+    # Verificar que la carpeta existe
+    if not os.path.exists(carpeta_tdms):
+        print(f"La carpeta {carpeta_tdms} no existe.")
+        return
+
+    temp_folder = _carpeta_incompletos()
+
+    # Recuperar los días incompletos de la ejecución anterior para seguir completándolos;
+    # se completan en la carpeta temporal y solo salen de ella al cerrar el día, para que
+    # un error a mitad de la ejecución no los pierda
+    rutas_dias = {}
+    for temp_file_name in os.listdir(temp_folder):
+        if temp_file_name.endswith("_temp.mat"):
+            date = temp_file_name[:-len("_temp.mat")]
+            rutas_dias[date] = os.path.join(temp_folder, temp_file_name)
+
+    # Lista de archivos TDMS en la carpeta, en orden cronológico por nombre
+    archivos_tdms = sorted(
+        os.path.join(carpeta_tdms, archivo)
+        for archivo in os.listdir(carpeta_tdms)
+        if archivo.endswith(".tdms")
+    )
+
+    if not archivos_tdms and not rutas_dias:
+        print(f"No se encontraron archivos TDMS en la carpeta {carpeta_tdms}.")
+        return
+    print(f"Número de WORKERS: {num_workers}")
+
+    # Un .mat abierto por día, creado la primera vez que aparece una muestra de ese día
+    abiertos = {}
+    try:
+        with tqdm(total=len(archivos_tdms), desc="Procesando archivos TDMS", unit="archivo") as barra:
+            with _crear_executor(num_workers) as executor:
+                # Los resultados llegan en el orden de los archivos, por lo que las muestras llegan
+                # ordenadas; como mucho 2 archivos leídos por proceso esperan en memoria a ser añadidos
+                ventana = 2 * (num_workers or os.cpu_count() or 1)
+                for archivo, resultado in _mapear_en_orden(executor, leer_tdms, archivos_tdms, ventana):
+                    barra.update(1)
+                    if resultado is None:
+                        continue
+                    tiempo, datos = resultado
+
+                    # Segundos desde 1970-01-01 con precisión de microsegundos, igual que en _variables_mat
+                    time_epoch = tiempo.astype(np.int64) / 1e6
+
+                    # Separar las muestras por día (índice entero de días desde 1970-01-01; las
+                    # marcas inválidas quedan fuera) y añadirlas al .mat de cada día
+                    dias = tiempo.astype('datetime64[D]').astype(np.int64)
+                    # La fecha como texto solo se construye una vez por día, para nombrar el archivo
+                    tramos = [(str(np.datetime64(int(dia), 'D')), filas)
+                              for dia, filas in _tramos_por_dia(dias, np.isnat(tiempo))]
+
+                    # Un TDMS con otro número de canales que el .mat de su día no se puede
+                    # añadir: se informa y se conserva el archivo sin tocar ningún día
+                    distinto = None
+                    for date, _ in tramos:
+                        if date in rutas_dias:
+                            if date not in abiertos:
+                                abiertos[date] = h5py.File(rutas_dias[date], 'r+')
+                            if abiertos[date]['data'].shape[0] != datos.shape[1]:
+                                distinto = (date, abiertos[date]['data'].shape[0])
+                                break
+                    if distinto is not None:
+                        print(f"Error al procesar {archivo}: tiene {datos.shape[1]} canales y el día "
+                              f"{distinto[0]} tiene {distinto[1]}; se conserva el archivo sin procesar")
+                        continue
+
+                    for date, filas in tramos:
+                        if date not in rutas_dias:
+                            rutas_dias[date] = os.path.join(carpeta_tdms, f"{date}.dia.mat")
+                            # int16 necesita el rango del día completo: se acumula en float64
+                            # (sea cual sea el tipo de los canales) y se cuantiza al cerrar el día
+                            dtype_dia = np.float64 if dtype == 'int16' else dtype
+                            _crear_mat_diario(rutas_dias[date], datos.shape[1], dtype_dia, compress)
+                            abiertos[date] = h5py.File(rutas_dias[date], 'r+')
+                        _anadir_a_mat_diario(abiertos[date], time_epoch[filas], datos[filas])
+
+                    # Eliminar el TDMS (y su índice) una vez guardados sus datos
+                    _eliminar_tdms(archivo)
+    finally:
+        for f in abiertos.values():
+            f.close()
+
+    # Cerrar cada día: ordenar si hace falta y verificar si está completo
+    for date in tqdm(sorted(rutas_dias), desc="Generando archivos MAT por día", unit="día"):
+        ruta_dia = rutas_dias[date]
+        last_time = _finalizar_mat_diario(ruta_dia)
+        output_file = os.path.join(carpeta_tdms, _nombre_mat(date, unidad))
+
+        # Verificar si el archivo está completo hasta las 23:59:59
+        if last_time.hour != 23 or last_time.minute != 59 or last_time.second != 59:
+            # Guardar el día incompleto en la carpeta temporal; si no se genera su .mat,
+            # basta con moverlo (sin copiar los datos)
+            temp_file = os.path.join(temp_folder, f"{date}_temp.mat")
+            if ruta_dia != temp_file:
+                shutil.move(ruta_dia, temp_file)
+            if not procesar_incompleto:
+                continue
+            # Copia real (no enlace duro): la siguiente ejecución añade muestras al archivo
+            # temporal en el lugar, y el .mat entregado no debe cambiar
+            ruta_dia = os.path.join(carpeta_tdms, f"{date}.dia.mat")
+            shutil.copy(temp_file, ruta_dia)
+
+        if dtype == 'int16':
+            _cuantizar_mat_diario(ruta_dia, compress)
+        # shutil.move: el día puede venir de la carpeta temporal, en otro disco
+        shutil.move(ruta_dia, output_file)
 
 def load_config(config_path):
     """
@@ -358,6 +1171,14 @@ def select_processing_option(input_folder, config):
     Muestra las opciones al usuario para seleccionar cómo procesar los archivos.
     Solicita si se desea procesar el último archivo incompleto y permite corregir errores.
     """
+    # Listar los ZIP una sola vez (scandir devuelve nombre y tipo en una sola llamada),
+    # no en cada reintento del menú
+    zip_files = sorted(
+        entrada.name for entrada in os.scandir(input_folder)
+        if entrada.name.endswith('.zip') and entrada.is_file()
+    )
+    last_processed_file = config.get('last_processed_file', None)
+
     while True:
         print("\nSeleccione una opción:")
         print("1. Procesar a partir del último archivo procesado")
@@ -366,12 +1187,11 @@ def select_processing_option(input_folder, config):
         print("4. Salir")
         option = input("Ingrese el número de su elección: ").strip()
 
-        zip_files = sorted([f for f in os.listdir(input_folder) if f.endswith('.zip')])
-        last_processed_file = config.get('last_processed_file', None)
-
         if option == "1":
             if last_processed_file:
-                start_index = zip_files.index(last_processed_file) + 1
+                # Los nombres están ordenados: los pendientes son los posteriores al último procesado,
+                # aunque ese archivo ya no esté en la carpeta
+                start_index = bisect.bisect_right(zip_files, last_processed_file)
                 files_to_process = zip_files[start_index:]
             else:
                 print("No hay registro de un último archivo procesado. Se procesarán todos los archivos.")
@@ -410,7 +1230,7 @@ def select_processing_option(input_folder, config):
 
         elif option == "4":
             print("Saliendo del programa.")
-            return None, None  # Indica que no se seleccionó nada
+            return None, None, None  # Indica que no se seleccionó nada
 
         else:
             print("Opción no válida. Intente de nuevo.")
@@ -424,7 +1244,57 @@ def select_processing_option(input_folder, config):
 
         return files_to_process, procesar_incompleto, unidad
 
+def _copiar_o_mover(source_path, dest_path, mismo_disco):
+    """
+    Lleva un archivo a su destino: si está en el mismo sistema de archivos lo renombra
+    (sin copiar datos); si no, lo copia conservando sus metadatos.
+    """
+    if mismo_disco:
+        os.replace(source_path, dest_path)
+    else:
+        shutil.copy2(source_path, dest_path)
+
+def copiar_resultados(temp_folder, output_folder, num_workers=8):
+    """
+    Copia el contenido de la carpeta temporal a la carpeta de salida, manteniendo la
+    estructura de subcarpetas. Los archivos se copian en paralelo con varios hilos
+    (la copia es de E/S y libera el GIL). Si ambas carpetas están en el mismo disco, los
+    archivos se mueven en lugar de copiarse, ya que la carpeta temporal se elimina al final.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    mismo_disco = os.stat(temp_folder).st_dev == os.stat(output_folder).st_dev
+
+    # Reunir todos los pares (origen, destino) y crear antes las subcarpetas de destino
+    pares = []
+    for root, _, files in os.walk(temp_folder):
+        dest_root = os.path.join(output_folder, os.path.relpath(root, temp_folder))
+        os.makedirs(dest_root, exist_ok=True)
+        pares.extend((os.path.join(root, file), os.path.join(dest_root, file)) for file in files)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futuros = {
+            executor.submit(_copiar_o_mover, source_path, dest_path, mismo_disco): source_path
+            for source_path, dest_path in pares
+        }
+        for futuro in as_completed(futuros):
+            try:
+                futuro.result()
+            except Exception as e:
+                print(f"Error copiando {futuros[futuro]}: {e}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Descomprime archivos TDMS y los convierte a archivos .mat diarios.")
+    salida = parser.add_mutually_exclusive_group()
+    salida.add_argument("--parquet", action="store_true",
+                        help="Generar un dataset Parquet particionado por día (zstd) en lugar de archivos .mat.")
+    salida.add_argument("--emit-csv", action="store_true",
+                        help="Usar el camino con archivos intermedios (TDMS -> Feather -> CSV diario -> MAT) y entregar también los CSV diarios, para depuración.")
+    parser.add_argument("--dtype", choices=["float64", "float32", "int16"], default="float32",
+                        help="Precisión de los datos en los .mat (int16 agrega 'scale' y 'offset' por canal).")
+    parser.add_argument("--compress", action="store_true",
+                        help="Comprimir los datos de los .mat (deflate, legible por MATLAB); archivos más chicos, escritura más lenta.")
+    args = parser.parse_args()
+
     config_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "config.json")
 
     # Cargar configuración
@@ -458,25 +1328,27 @@ def main():
         config['last_processed_file'] = files_to_process[-1]  # Se actualiza con el último archivo procesado
         save_config(config, config_path)
 
-        # Procesar archivos TDMS en paralelo en la carpeta temporal
-        # procesar_archivos_tdms_paralelo(temp_folder, num_workers=4)
-        procesar_archivos_tdms_paralelo(temp_folder, num_workers=os.cpu_count()-2)
-
-        # Ejecutar la función para ordenar y agrupar por día en la carpeta temporal
-        ordenar_y_agrupado_por_dia(temp_folder, procesar_incompleto)
-
-        # Convertir de CSV a MAT en la carpeta temporal
-        csv_to_mat(temp_folder, unidad)
+        if args.parquet:
+            # Agregar los TDMS al dataset Parquet particionado por día en la carpeta temporal
+            procesar_archivos_tdms_paralelo(temp_folder, temp_folder, num_workers=os.cpu_count()-2,
+                                            convertir=convertir_tdms_a_parquet)
+        elif args.emit_csv:
+            # Procesar archivos TDMS en paralelo en la carpeta temporal
+            # procesar_archivos_tdms_paralelo(temp_folder, temp_folder, num_workers=4)
+            procesar_archivos_tdms_paralelo(temp_folder, temp_folder, num_workers=os.cpu_count()-2,
+                                            convertir=convertir_tdms_a_feather)
+
+            # Ordenar y agrupar por día en la carpeta temporal, guardando cada día como CSV y MAT
+            ordenar_y_agrupado_por_dia(temp_folder, procesar_incompleto, unidad, dtype=args.dtype,
+                                       compress=args.compress)
+        else:
+            # Convertir los TDMS directamente a archivos MAT diarios en la carpeta temporal
+            procesar_tdms_a_mat(temp_folder, unidad, procesar_incompleto, num_workers=os.cpu_count()-2,
+                                compress=args.compress, dtype=args.dtype)
 
         # Copiar los resultados procesados a la carpeta de salida final
         print("Copiando archivos procesados a la carpeta de salida...")
-        for item in os.listdir(temp_folder):
-            source_path = os.path.join(temp_folder, item)
-            dest_path = os.path.join(output_folder, item)
-            if os.path.isdir(source_path):
-                shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-            else:
-                shutil.copy2(source_path, dest_path)
+        copiar_resultados(temp_folder, output_folder)
 
     finally:
         # Eliminar la carpeta temporal al finalizar